@@ -1,3 +1,4 @@
+import re
 import uuid
 from pathlib import Path
 
@@ -14,6 +15,10 @@ router = APIRouter(prefix="/assets", tags=["assets"])
 UPLOAD_DIR = Path(__file__).resolve().parent.parent.parent / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Stored names are "<uuid><suffix>"; anything outside this is dropped so the
+# name survives URL encoding unchanged
+SAFE_SUFFIX = re.compile(r"^\.[A-Za-z0-9]{1,10}$")
+
 # Expose uploads as static at /uploads (mounted in main)
 
 
@@ -56,7 +61,9 @@ async def delete_asset(asset_id: str):
 
 @router.post("/upload")
 async def upload_image(file: UploadFile = File(...)):
-    suffix = Path(file.filename).suffix or ".bin"
+    suffix = Path(file.filename or "").suffix
+    if not SAFE_SUFFIX.match(suffix):
+        suffix = ".bin"
     name = f"{uuid.uuid4()}{suffix}"
     dest = UPLOAD_DIR / name
     content = await file.read()
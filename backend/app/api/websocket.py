@@ -6,6 +6,8 @@ router = APIRouter()
 
 @router.websocket("/ws")
 async def ws_endpoint(websocket: WebSocket):
+    # permessage-deflate is negotiated by the server protocol during the
+    # handshake (see app/util/ws_compression.py), not by accept()
     await WS_MANAGER.connect(websocket)
     try:
         while True:
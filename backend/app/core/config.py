@@ -28,6 +28,49 @@ class Settings(BaseSettings):
     # Poll the external source of truth periodically (seconds). 0 to disable.
     POLL_INTERVAL_SEC: float = 0
 
+    # Background cleanup of uploads/ files no asset references (seconds).
+    # 0 disables the sweeper.
+    UPLOAD_GC_INTERVAL_SEC: float = 600
+    # Unreferenced files younger than this (since upload or since the last
+    # asset let go of them) are kept, so a fresh upload can still be attached.
+    UPLOAD_GC_GRACE_SEC: float = 3600
+    # Delete at most this many files per batch, then pause to stay out of the way
+    UPLOAD_GC_BATCH_SIZE: int = 100
+    UPLOAD_GC_BATCH_PAUSE_SEC: float = 0.5
+
+    # gzip/brotli for /api responses at least this many bytes
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Bodies at least this large are compressed off the event loop
+    COMPRESSION_THREAD_MIN_SIZE: int = 256 * 1024
+
+    # permessage-deflate on /ws (see app/util/ws_compression.py)
+    WS_DEFLATE_ENABLED: bool = True
+    WS_DEFLATE_LEVEL: int = 6
+    # Keep the compressor window between messages: better ratio on repetitive
+    # events at the cost of per-connection memory.
+    WS_DEFLATE_CONTEXT_TAKEOVER: bool = True
+    WS_DEFLATE_MAX_WINDOW_BITS: int = 12
+
+    # Admission control for mutating /api requests (see app/util/admission.py)
+    ADMISSION_ENABLED: bool = True
+    # Per-client token buckets. The frontend sends an upload plus a
+    # POST /api/assets per dropped file, so bursts cover a 100-file drop.
+    MUTATION_RATE_PER_SEC: float = 20
+    MUTATION_BURST: int = 100
+    UPLOAD_RATE_PER_SEC: float = 10
+    UPLOAD_BURST: int = 100
+    # Concurrent mutations/uploads, and how long a request may queue for a
+    # slot before it is rejected with 503
+    MUTATION_CONCURRENCY: int = 16
+    MUTATION_QUEUE_BUDGET_SEC: float = 0.1
+    UPLOAD_CONCURRENCY: int = 4
+    UPLOAD_QUEUE_BUDGET_SEC: float = 2.0
+    # Event-loop backlog above which mutations and uploads are shed with 503
+    # (heavy clients first, everyone at twice this)
+    ADMISSION_LOOP_LAG_BUDGET_SEC: float = 0.02
+
     class Config:
         env_file = ".env"
 
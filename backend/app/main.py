@@ -5,6 +5,9 @@ from app.api import api
 from app.api.websocket import router as ws_router
 from app.core.config import settings
 from app.core.logging_config import configure_logging
+from app.services.upload_gc import UPLOAD_GC
+from app.util.admission import ADMISSION, AdmissionMiddleware
+from app.util.compression import CompressionMiddleware
 
 # from app.models.screen_models import ScreenCreate  # removed: no default seeding
 from fastapi import FastAPI
@@ -19,6 +22,10 @@ configure_logging(logging.DEBUG if settings.ENV == "dev" else logging.INFO)
 # Disable default docs so we can provide a customized /docs route below
 app = FastAPI(title=settings.APP_NAME, docs_url=None, redoc_url=None)
 
+# Shed abusive mutation/upload traffic (added before CORS so rejections
+# still carry CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +33,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
+)
+
+# Compress API responses (asset lists are large, repetitive JSON)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    thread_min_size=settings.COMPRESSION_THREAD_MIN_SIZE,
 )
 
 # Static uploads
@@ -46,8 +63,8 @@ app.include_router(ws_router)
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health() -> dict[str, object]:
+    return {"status": "ok", "admission": ADMISSION.stats()}
 
 
 @app.on_event("startup")
@@ -57,6 +74,26 @@ async def seed_default_data() -> None:
     return None
 
 
+@app.on_event("startup")
+async def start_upload_gc() -> None:
+    UPLOAD_GC.start()
+
+
+@app.on_event("startup")
+async def start_admission() -> None:
+    ADMISSION.start()
+
+
+@app.on_event("shutdown")
+async def stop_upload_gc() -> None:
+    await UPLOAD_GC.stop()
+
+
+@app.on_event("shutdown")
+async def stop_admission() -> None:
+    await ADMISSION.stop()
+
+
 @app.get("/docs", include_in_schema=False)
 def custom_swagger_ui() -> HTMLResponse:
     return get_swagger_ui_html(
@@ -0,0 +1,165 @@
+"""Bytes-on-the-wire and CPU cost of API/WebSocket compression.
+
+Builds a synthetic layout (default 10k assets), then measures:
+
+- ``GET /api/assets`` body size and compression time for identity, gzip and
+  brotli at the levels the middleware uses;
+- per-event frame size and CPU time for ``asset_updated`` broadcasts (the
+  drag hot path) under permessage-deflate with and without context takeover.
+
+Run with ``uv run bench-compression`` or ``python -m app.scripts.bench_compression``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+import zlib
+from typing import Callable
+
+from app.models.asset_models import ImageAsset, TextAsset
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_layout(n_assets: int, n_screens: int, rng: random.Random) -> list:
+    screens = [str(uuid.uuid4()) for _ in range(n_screens)]
+    assets = []
+    for i in range(n_assets):
+        common = dict(
+            id=str(uuid.uuid4()),
+            screen_id=rng.choice(screens),
+            x=round(rng.uniform(0, 3840), 2),
+            y=round(rng.uniform(0, 2160), 2),
+            z_index=i,
+            rotation=rng.choice([0.0, 0.0, 0.0, 90.0, round(rng.uniform(0, 360), 1)]),
+        )
+        if rng.random() < 0.7:
+            assets.append(
+                ImageAsset(
+                    src=f"http://localhost:8000/uploads/{uuid.uuid4()}.png",
+                    natural_width=1920,
+                    natural_height=1080,
+                    width=round(rng.uniform(100, 800), 1),
+                    height=round(rng.uniform(100, 600), 1),
+                    **common,
+                )
+            )
+        else:
+            assets.append(TextAsset(text=f"Label {i}", **common))
+    return assets
+
+
+def event_payload(event: str, data) -> bytes:
+    # Same encoding as ConnectionManager.broadcast
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False).encode()
+
+
+def drag_events(assets: list, n_events: int, rng: random.Random) -> list[bytes]:
+    events = []
+    for _ in range(n_events):
+        a = rng.choice(assets)
+        moved = a.model_copy(
+            update={"x": a.x + rng.uniform(-5, 5), "y": a.y + rng.uniform(-5, 5)}
+        )
+        events.append(event_payload("asset_updated", moved.model_dump(mode="json")))
+    return events
+
+
+def time_it(fn: Callable[[], bytes], repeat: int) -> tuple[int, float]:
+    samples = []
+    out = b""
+    for _ in range(repeat):
+        t0 = time.process_time()
+        out = fn()
+        samples.append(time.process_time() - t0)
+    return len(out), statistics.median(samples)
+
+
+def bench_http(body: bytes, repeat: int) -> list[tuple[str, int, float]]:
+    rows = [("identity", len(body), 0.0)]
+    for level in (1, 6):
+        size, cpu = time_it(lambda lv=level: _gzip(body, lv), repeat)
+        rows.append((f"gzip-{level}", size, cpu))
+    if brotli is not None:
+        for quality in (4, 6):
+            size, cpu = time_it(
+                lambda q=quality: brotli.compress(body, quality=q), repeat
+            )
+            rows.append((f"br-{quality}", size, cpu))
+    return rows
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return z.compress(body) + z.flush()
+
+
+def bench_ws(
+    events: list[bytes], level: int, takeover: bool, window_bits: int
+) -> tuple[float, float]:
+    """Average frame payload bytes and CPU microseconds per event."""
+    ext = PerMessageDeflate(
+        remote_no_context_takeover=not takeover,
+        local_no_context_takeover=not takeover,
+        remote_max_window_bits=window_bits,
+        local_max_window_bits=window_bits,
+        compress_settings={"level": level, "memLevel": 5},
+    )
+    total = 0
+    t0 = time.process_time()
+    for data in events:
+        total += len(ext.encode(Frame(Opcode.TEXT, data)).data)
+    cpu = time.process_time() - t0
+    return total / len(events), cpu / len(events) * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench-compression",
+        description="Measure API and WebSocket compression on a synthetic layout.",
+    )
+    parser.add_argument("--assets", type=int, default=10_000)
+    parser.add_argument("--screens", type=int, default=8)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--window-bits", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    assets = build_layout(args.assets, args.screens, rng)
+    body = json.dumps([a.model_dump(mode="json") for a in assets]).encode()
+
+    print(f"GET /api/assets ({args.assets} assets)")
+    print(f"  {'encoding':<10} {'bytes':>12} {'ratio':>7} {'cpu ms':>9}")
+    for name, size, cpu in bench_http(body, args.repeat):
+        print(f"  {name:<10} {size:>12,} {len(body) / size:>7.1f} {cpu * 1e3:>9.2f}")
+    if brotli is None:
+        print('  (brotli not installed: pip install "web-buddy-backend[brotli]")')
+
+    events = drag_events(assets, args.events, rng)
+    raw = sum(len(e) for e in events) / len(events)
+    print(f"\n/ws asset_updated ({args.events} events, window {args.window_bits})")
+    print(f"  {'mode':<22} {'bytes/event':>12} {'ratio':>7} {'cpu us/event':>13}")
+    print(f"  {'uncompressed':<22} {raw:>12.1f} {1.0:>7.1f} {0.0:>13.1f}")
+    for level in (1, 6, 9):
+        for takeover in (True, False):
+            size, cpu = bench_ws(events, level, takeover, args.window_bits)
+            mode = f"deflate-{level} {'takeover' if takeover else 'no-takeover'}"
+            print(f"  {mode:<22} {size:>12.1f} {raw / size:>7.1f} {cpu:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,17 @@
 def main():
     import uvicorn
 
+    from app.util.ws_compression import DeflateWebSocketProtocol
+
     uvicorn.run(
-        "app.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True
+        "app.main:create_app",
+        factory=True,
+        host="0.0.0.0",
+        port=8000,
+        ws=DeflateWebSocketProtocol,
+        reload=True,
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Load test for admission control.
+
+Starts the backend under Uvicorn in a subprocess (once with admission control
+off, once on) and drives it over real sockets with:
+
+- interactive clients that release a drag (``PUT /api/assets/{id}``) and
+  refresh the asset list every ``--think`` seconds;
+- abusive clients hammering ``PUT`` from ``--abusers`` concurrent loops,
+  spread over ``--abuser-ips`` source addresses so per-IP rate limits alone
+  cannot absorb them;
+- a client uploading ``--upload-kb`` files from ``--uploaders`` loops.
+
+Abusive traffic runs in separate processes so the load generator does not
+compete with the measuring client. Each client binds its own 127.0.x.y
+source address, so the server sees distinct client IPs (Linux loopback).
+The run fails (exit 1) if interactive p99 with admission on misses
+``--p99-target-ms``.
+Run with ``uv run loadtest-admission`` or
+``python -m app.scripts.loadtest_admission``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from app.api.routes_assets import UPLOAD_DIR
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def client_for(base_url: str, ip: str, **kwargs) -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(local_address=ip)
+    return httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=30.0, **kwargs
+    )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, admission: bool) -> subprocess.Popen:
+    env = dict(os.environ, ADMISSION_ENABLED=str(admission).lower(), ENV="prod")
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:create_app",
+            "--factory",
+            "--host",
+            "0.0.0.0",
+            "--port",
+            str(port),
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("backend did not start")
+
+
+# -- abusive load (runs in child processes) ---------------------------------
+
+
+def _raw_request(method: str, path: str, body: bytes, content_type: str) -> bytes:
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: loadtest\r\n"
+        f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def _raw_loop(
+    port: int, ip: str, request: bytes, stop: float, counts: Counter
+) -> None:
+    # Pre-built requests over a raw keep-alive socket keep the generator far
+    # cheaper than the server it is loading.
+    reader = writer = None
+    while time.time() < stop:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", port, local_addr=(ip, 0)
+            )
+        writer.write(request)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length, close = 0, False
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+            elif name.lower() == "connection" and "close" in value.lower():
+                close = True
+        body = await reader.readexactly(length)
+        counts[status] += 1
+        if status == 200 and b"/uploads/" in body:
+            name = body.split(b"/uploads/")[1].split(b'"')[0].decode()
+            (UPLOAD_DIR / name).unlink(missing_ok=True)
+        if close:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _abuse(
+    port: int, kind: str, n: int, n_ips: int, arg: str, stop: float, q
+) -> None:
+    counts: Counter = Counter()
+    if kind == "puts":
+        request = _raw_request(
+            "PUT", f"/api/assets/{arg}", b'{"x": 1}', "application/json"
+        )
+        ips = [f"127.0.2.{i + 1}" for i in range(n_ips)]
+    else:
+        boundary = "loadtestboundary"
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            f'filename="load.bin"\r\nContent-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        body += b"\0" * (int(arg) * 1024) + f"\r\n--{boundary}--\r\n".encode()
+        request = _raw_request(
+            "POST",
+            "/api/assets/upload",
+            body,
+            f"multipart/form-data; boundary={boundary}",
+        )
+        ips = ["127.0.0.77"]
+    await asyncio.gather(
+        *(_raw_loop(port, ips[i % len(ips)], request, stop, counts) for i in range(n))
+    )
+    q.put((kind, dict(counts)))
+
+
+def _abuse_proc(*args) -> None:
+    asyncio.run(_abuse(*args))
+
+
+# -- interactive clients (measured in this process) -------------------------
+
+
+async def interactive(
+    base_url: str, ip: str, asset_ids: list[str], stop: float, think: float, out
+) -> None:
+    async with client_for(base_url, ip) as client:
+        i = 0
+        while time.time() < stop:
+            aid = asset_ids[i % len(asset_ids)]
+            t0 = time.perf_counter()
+            r = await client.put(f"/api/assets/{aid}", json={"x": i, "y": i})
+            out["latency"].append(time.perf_counter() - t0)
+            out["status"][r.status_code] += 1
+            t0 = time.perf_counter()
+            await client.get("/api/assets")
+            out["read_latency"].append(time.perf_counter() - t0)
+            i += 1
+            await asyncio.sleep(think)
+
+
+async def seed(base_url: str, n_assets: int) -> list[str]:
+    # Seeding runs from its own address so it spends nobody else's tokens;
+    # pace it under the default bucket rate.
+    async with client_for(base_url, "127.0.0.2") as client:
+        r = await client.post(
+            "/api/screens", json={"name": "load", "width": 1920, "height": 1080}
+        )
+        sid = r.json()["id"]
+        ids = []
+        for i in range(n_assets):
+            while True:
+                r = await client.post(
+                    "/api/assets",
+                    json={"screen_id": sid, "type": "text", "text": f"t{i}"},
+                )
+                if r.status_code == 200:
+                    break
+                await asyncio.sleep(float(r.headers.get("retry-after", "1")))
+            ids.append(r.json()["id"])
+    return ids
+
+
+async def sample_lag(base_url: str, stop: float, out) -> None:
+    async with client_for(base_url, "127.0.0.3") as client:
+        while time.time() < stop:
+            r = await client.get("/health")
+            out["loop_lag_ms"].append(r.json()["admission"]["loop_lag_ms"])
+            await asyncio.sleep(0.25)
+
+
+async def run_interactive(
+    base_url: str, args: argparse.Namespace, asset_ids: list[str], stop: float
+) -> dict:
+    out = {"latency": [], "read_latency": [], "status": Counter(), "loop_lag_ms": []}
+    await asyncio.gather(
+        sample_lag(base_url, stop, out),
+        *(
+            interactive(base_url, f"127.0.1.{n + 1}", asset_ids, stop, args.think, out)
+            for n in range(args.interactive)
+        ),
+    )
+    return out
+
+
+def run_scenario(args: argparse.Namespace, admission: bool) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(port, admission)
+    try:
+        asset_ids = asyncio.run(seed(base_url, args.assets))
+        ctx = mp.get_context("spawn")
+        q = ctx.Queue()
+        # Give the children time to start before the clock runs
+        stop = time.time() + 1.0 + args.duration
+        procs = [
+            ctx.Process(
+                target=_abuse_proc,
+                args=(
+                    port,
+                    "puts",
+                    args.abusers,
+                    args.abuser_ips,
+                    asset_ids[0],
+                    stop,
+                    q,
+                ),
+            ),
+            ctx.Process(
+                target=_abuse_proc,
+                args=(
+                    port,
+                    "uploads",
+                    args.uploaders,
+                    1,
+                    str(args.upload_kb),
+                    stop,
+                    q,
+                ),
+            ),
+        ]
+        for p in procs:
+            p.start()
+        inter = asyncio.run(run_interactive(base_url, args, asset_ids, stop))
+        results = dict(q.get() for _ in procs)
+        for p in procs:
+            p.join()
+        server_stats = httpx.get(f"{base_url}/health").json()["admission"]
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "inter": inter,
+        "server": server_stats,
+        "puts": Counter(results.get("puts", {})),
+        "uploads": Counter(results.get("uploads", {})),
+    }
+
+
+def report(name: str, res: dict, duration: float, target_ms: float) -> bool:
+    """Print one scenario; return whether interactive PUT p99 met the target."""
+    inter = res["inter"]
+    lat = [v * 1e3 for v in inter["latency"]]
+    reads = [v * 1e3 for v in inter["read_latency"]]
+    total = sum(inter["status"].values())
+    ok = inter["status"][200] / max(total, 1)
+    print(f"\n== admission {name} ==")
+    print(
+        f"  interactive PUT  n={total:<6} ok={ok:6.1%} "
+        f"p50={statistics.median(lat) if lat else float('nan'):8.1f} ms "
+        f"p99={percentile(lat, 99):8.1f} ms"
+    )
+    print(
+        f"  interactive GET  n={len(reads):<6}           "
+        f"p50={statistics.median(reads) if reads else float('nan'):8.1f} ms "
+        f"p99={percentile(reads, 99):8.1f} ms"
+    )
+    for label in ("puts", "uploads"):
+        c = res[label]
+        print(
+            f"  abusive {label:<8} {sum(c.values()) / duration:7.0f} req/s  "
+            f"admitted={c[200]:<7} 429={c[429]:<7} 503={c[503]:<7}"
+        )
+    lag = inter["loop_lag_ms"]
+    print(
+        f"  server loop lag  p50={statistics.median(lag) if lag else 0:.1f} ms "
+        f"max={max(lag, default=0):.1f} ms  admission stats: {res['server']}"
+    )
+    p99 = percentile(lat, 99)
+    met = p99 <= target_ms
+    print(
+        f"  interactive PUT p99 {p99:.1f} ms vs target {target_ms:.0f} ms: "
+        f"{'PASS' if met else 'FAIL'}"
+    )
+    return met
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="loadtest-admission",
+        description="Interactive latency with and without admission control.",
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--assets", type=int, default=100)
+    parser.add_argument("--interactive", type=int, default=5)
+    parser.add_argument("--think", type=float, default=0.1)
+    parser.add_argument("--abusers", type=int, default=64)
+    parser.add_argument("--abuser-ips", type=int, default=16)
+    parser.add_argument("--uploaders", type=int, default=16)
+    parser.add_argument("--upload-kb", type=int, default=2048)
+    parser.add_argument("--p99-target-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    met = False
+    for admission in (False, True):
+        res = run_scenario(args, admission)
+        met = report(
+            "on" if admission else "off", res, args.duration, args.p99_target_ms
+        )
+    # Only the admission-on run is expected to meet the target
+    return 0 if met else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
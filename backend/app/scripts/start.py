@@ -1,7 +1,22 @@
 def main():
+    import os
+
     import uvicorn
 
-    # Uses factory, matching your previous CLI usage
+    from app.util.ws_compression import DeflateWebSocketProtocol
+
+    # Uses factory, matching your previous CLI usage. HOST/PORT let Docker
+    # override the bind address; the WebSocket protocol must be passed as a
+    # class, since uvicorn's --ws/ws= strings only name its built-ins.
     uvicorn.run(
-        "app.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=False
+        "app.main:create_app",
+        factory=True,
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        ws=DeflateWebSocketProtocol,
+        reload=False,
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.api.routes_assets import UPLOAD_DIR
+from app.core.config import settings
+from app.state.memory_state import STATE, InMemoryState
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepResult:
+    scanned: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+
+
+def _scan(directory: Path) -> list[tuple[str, float, int]]:
+    entries: list[tuple[str, float, int]] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name, st.st_mtime, st.st_size))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class UploadGarbageCollector:
+    """Periodically removes files in uploads/ that no asset references.
+
+    A file is only eligible once it has been unreferenced for the grace
+    period, measured from its mtime or from the moment the last referencing
+    asset was deleted/re-pointed, whichever is later. Deletions run in
+    throttled batches off the event loop, each file re-checked and removed
+    under its own short hold of the state lock.
+    """
+
+    def __init__(
+        self,
+        state: InMemoryState,
+        directory: Path = UPLOAD_DIR,
+        interval: float = settings.UPLOAD_GC_INTERVAL_SEC,
+        grace: float = settings.UPLOAD_GC_GRACE_SEC,
+        batch_size: int = settings.UPLOAD_GC_BATCH_SIZE,
+        batch_pause: float = settings.UPLOAD_GC_BATCH_PAUSE_SEC,
+    ) -> None:
+        self.state = state
+        self.directory = directory
+        self.interval = interval
+        self.grace = grace
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.total_deleted = 0
+        self.total_reclaimed_bytes = 0
+        self._task: asyncio.Task | None = None
+
+    async def sweep(self) -> SweepResult:
+        result = SweepResult()
+        entries = await asyncio.to_thread(_scan, self.directory)
+        result.scanned = len(entries)
+        # Release times of files that are gone (never uploaded here, or
+        # removed by someone else) would otherwise be kept forever
+        self.state.forget_missing_uploads(name for name, _, _ in entries)
+        candidates = [
+            (name, mtime, size)
+            for name, mtime, size in entries
+            if self.state.is_upload_orphaned(name, mtime, self.grace)
+        ]
+        for start in range(0, len(candidates), self.batch_size):
+            if start:
+                await asyncio.sleep(self.batch_pause)
+            for name, mtime, size in candidates[start : start + self.batch_size]:
+                try:
+                    removed = await self.state.remove_orphaned_upload(
+                        name, mtime, self.grace, self._unlink
+                    )
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    log.warning(
+                        "Could not remove orphaned upload %s", name, exc_info=True
+                    )
+                    continue
+                if removed:
+                    result.deleted += 1
+                    result.reclaimed_bytes += size
+
+        self.total_deleted += result.deleted
+        self.total_reclaimed_bytes += result.reclaimed_bytes
+        if result.deleted:
+            log.info(
+                "Upload GC removed %d of %d files, reclaimed %d bytes (total %d bytes)",
+                result.deleted,
+                result.scanned,
+                result.reclaimed_bytes,
+                self.total_reclaimed_bytes,
+            )
+        else:
+            log.debug("Upload GC scanned %d files, nothing to reclaim", result.scanned)
+        return result
+
+    def _unlink(self, name: str) -> None:
+        (self.directory / name).unlink()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception:
+                log.exception("Upload GC sweep failed")
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+UPLOAD_GC = UploadGarbageCollector(STATE)
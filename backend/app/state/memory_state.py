@@ -1,7 +1,11 @@
 import asyncio
+import time
 import uuid
-from typing import Dict, List
+from pathlib import PurePosixPath
+from typing import Callable, Dict, Iterable, List, Set
+from urllib.parse import unquote, urlsplit
 
+from app.core.config import settings
 from app.models.asset_models import (
     Asset,
     AssetCreate,
@@ -11,12 +15,107 @@ from app.models.asset_models import (
 )
 from app.models.screen_models import Screen, ScreenCreate, ScreenUpdate
 
+UPLOADS_PREFIX = "/uploads/"
+
+
+def upload_name_for(asset: Asset) -> str | None:
+    """Return the uploads/ filename an asset points at, if any.
+
+    With ``PUBLIC_BASE_URL`` set only URLs on that host count; otherwise the
+    upload route hands out relative URLs that clients resolve against
+    whichever host they reached us on, so any host is accepted.
+    """
+    if not isinstance(asset, ImageAsset):
+        return None
+    src = urlsplit(str(asset.src))
+    prefix = UPLOADS_PREFIX
+    if settings.PUBLIC_BASE_URL:
+        base = urlsplit(str(settings.PUBLIC_BASE_URL))
+        if (src.hostname, src.port) != (base.hostname, base.port):
+            return None
+        prefix = f"{base.path.rstrip('/')}{UPLOADS_PREFIX}"
+    # HttpUrl percent-encodes the path; files on disk use the raw name
+    path = unquote(src.path)
+    if not path.startswith(prefix):
+        return None
+    name = PurePosixPath(path).name
+    # Only direct children of uploads/ are ours to track
+    if path != f"{prefix}{name}" or name in ("", ".", ".."):
+        return None
+    return name
+
 
 class InMemoryState:
     def __init__(self) -> None:
         self._screens: Dict[str, Screen] = {}
         self._assets: Dict[str, Asset] = {}
         self._lock = asyncio.Lock()
+        # upload filename -> ids of assets whose src points at it
+        self._upload_refs: Dict[str, Set[str]] = {}
+        # upload filename -> wall-clock time its last reference was dropped
+        self._upload_released: Dict[str, float] = {}
+
+    def _ref_upload(self, asset: Asset) -> None:
+        name = upload_name_for(asset)
+        if name is None:
+            return
+        self._upload_refs.setdefault(name, set()).add(asset.id)
+        self._upload_released.pop(name, None)
+
+    def _unref_upload(self, asset: Asset) -> None:
+        name = upload_name_for(asset)
+        if name is None:
+            return
+        refs = self._upload_refs.get(name)
+        if refs is None:
+            return
+        refs.discard(asset.id)
+        if not refs:
+            del self._upload_refs[name]
+            self._upload_released[name] = time.time()
+
+    def upload_released_at(self, name: str) -> float | None:
+        """When the last asset referencing ``name`` let go of it, if ever."""
+        return self._upload_released.get(name)
+
+    def is_upload_orphaned(self, name: str, mtime: float, grace: float) -> bool:
+        """Whether no asset has used ``name`` for at least ``grace`` seconds.
+
+        Idleness counts from the file's mtime or from when its last asset let
+        go of it, whichever is later.
+        """
+        if name in self._upload_refs:
+            return False
+        last_used = max(mtime, self._upload_released.get(name, 0.0))
+        return time.time() - last_used >= grace
+
+    async def remove_orphaned_upload(
+        self, name: str, mtime: float, grace: float, remove: Callable[[str], None]
+    ) -> bool:
+        """Run ``remove(name)`` in a worker thread if the upload is an orphan.
+
+        The check and the removal share one hold of the lock so no asset can
+        claim the file in between; taking it per file keeps mutations from
+        queueing behind more than a single unlink. Returns False if the file
+        is in use again. ``FileNotFoundError`` from ``remove`` counts as
+        removed for bookkeeping and is re-raised, as is any other error.
+        """
+        async with self._lock:
+            if not self.is_upload_orphaned(name, mtime, grace):
+                return False
+            try:
+                await asyncio.to_thread(remove, name)
+            except FileNotFoundError:
+                self._upload_released.pop(name, None)
+                raise
+            self._upload_released.pop(name, None)
+            return True
+
+    def forget_missing_uploads(self, present: Iterable[str]) -> None:
+        """Drop release times for files that are not on disk."""
+        present = set(present)
+        for name in [n for n in self._upload_released if n not in present]:
+            del self._upload_released[name]
 
     async def list_screens(self) -> List[Screen]:
         return list(self._screens.values())
@@ -51,7 +150,9 @@ class InMemoryState:
                     aid for aid, a in self._assets.items() if a.screen_id == screen_id
                 ]
                 for aid in to_del:
-                    self._assets.pop(aid, None)
+                    removed = self._assets.pop(aid, None)
+                    if removed is not None:
+                        self._unref_upload(removed)
                 self._screens.pop(screen_id, None)
             return existed
 
@@ -70,6 +171,7 @@ class InMemoryState:
                 payload.setdefault("text", "New Text")
                 asset = TextAsset(id=aid, **payload)  # type: ignore
             self._assets[aid] = asset
+            self._ref_upload(asset)
             return asset
 
     async def update_asset(self, asset_id: str, data: AssetUpdate) -> Asset | None:
@@ -81,11 +183,17 @@ class InMemoryState:
                 update={k: v for k, v in data.model_dump(exclude_none=True).items()}
             )
             self._assets[asset_id] = updated
+            self._unref_upload(a)
+            self._ref_upload(updated)
             return updated
 
     async def delete_asset(self, asset_id: str) -> bool:
         async with self._lock:
-            return self._assets.pop(asset_id, None) is not None
+            removed = self._assets.pop(asset_id, None)
+            if removed is None:
+                return False
+            self._unref_upload(removed)
+            return True
 
 
 STATE = InMemoryState()
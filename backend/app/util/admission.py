@@ -0,0 +1,317 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core.config import settings
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+UPLOAD_PATH = "/api/assets/upload"
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: float) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Consume a token; return 0 on success, else seconds until one is free."""
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class ClientRateLimiter:
+    """One token bucket per client key, pruned once idle buckets pile up."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def check(self, key: str) -> TokenBucket:
+        """Spend one of ``key``'s tokens, or raise 429 if it has none left."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune()
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        wait = bucket.take()
+        if wait:
+            raise Rejected(429, "Too many requests", wait)
+        return bucket
+
+    def _prune(self) -> None:
+        # A full bucket carries no state a fresh one wouldn't
+        now = time.monotonic()
+        for key in [k for k, b in self._buckets.items() if b.is_full(now)]:
+            del self._buckets[key]
+
+
+class LoopLagMonitor:
+    """Measures how far behind schedule the event loop is running.
+
+    Every ``interval`` seconds a sleeper notes how late it woke up. ``lag``
+    is the smallest of the last ``window`` samples, so one slow callback
+    does not count as overload, but a standing queue of ready work does.
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 4) -> None:
+        self.interval = interval
+        self._samples: deque[float] = deque([0.0], maxlen=window)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def lag(self) -> float:
+        return min(self._samples)
+
+    def record(self, sample: float) -> None:
+        self._samples.append(max(0.0, sample))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - started - self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+class ConcurrencyLimiter:
+    """Bounded concurrency with queueing budgets and two priorities.
+
+    Admission is judged on observed queueing: the expected wait for a slot
+    (requests ahead times the average time a slot is held) against
+    ``budget``, and, when a ``LoopLagMonitor`` is attached, the event loop's
+    own backlog against ``lag_budget``. Requests over either budget are
+    rejected with 503 rather than queued, as are requests that do queue
+    longer than ``budget``.
+
+    ``heavy`` requests (clients that have spent much of their burst) queue
+    behind all light ones and are shed at the budgets; light requests are
+    shed only at twice those.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        budget: float,
+        lag: LoopLagMonitor | None = None,
+        lag_budget: float = 0.05,
+    ) -> None:
+        self.limit = max(1, limit)
+        self.budget = budget
+        self.lag = lag
+        self.lag_budget = lag_budget
+        self.in_flight = 0
+        self.avg_service = 0.01
+        self._waiters: dict[bool, deque[asyncio.Future]] = {
+            False: deque(),
+            True: deque(),
+        }
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters[False]) + len(self._waiters[True])
+
+    def estimated_wait(self, heavy: bool = True) -> float:
+        ahead = self.waiting if heavy else len(self._waiters[False])
+        if self.in_flight < self.limit and not ahead:
+            return 0.0
+        return (ahead + 1) / self.limit * self.avg_service
+
+    def overload(self, heavy: bool = True) -> float:
+        """Seconds of excess queueing, or 0 if this request may proceed."""
+        factor = 1 if heavy else 2
+        wait = self.estimated_wait(heavy)
+        if wait > self.budget * factor:
+            return wait
+        loop_lag = self.lag.lag if self.lag is not None else 0.0
+        if loop_lag > self.lag_budget * factor:
+            return loop_lag
+        return 0.0
+
+    def _release(self) -> None:
+        for queue in (self._waiters[False], self._waiters[True]):
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    # Hand the slot straight to the next waiter
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    async def _acquire(self, heavy: bool) -> None:
+        if self.in_flight < self.limit and not self.waiting:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[heavy].append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.budget)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release()
+            elif waiter in self._waiters[heavy]:
+                self._waiters[heavy].remove(waiter)
+            if isinstance(exc, TimeoutError):
+                raise Rejected(
+                    503, "Server busy, try again later", self.budget
+                ) from None
+            raise
+
+    @asynccontextmanager
+    async def slot(self, heavy: bool = True) -> AsyncIterator[None]:
+        excess = self.overload(heavy)
+        if excess:
+            raise Rejected(503, "Server busy, try again later", excess)
+        await self._acquire(heavy)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release()
+            elapsed = time.monotonic() - started
+            self.avg_service += 0.2 * (elapsed - self.avg_service)
+
+
+class AdmissionController:
+    def __init__(self) -> None:
+        self.enabled = settings.ADMISSION_ENABLED
+        self.loop_lag = LoopLagMonitor()
+        self.mutation_rate = ClientRateLimiter(
+            settings.MUTATION_RATE_PER_SEC, settings.MUTATION_BURST
+        )
+        self.upload_rate = ClientRateLimiter(
+            settings.UPLOAD_RATE_PER_SEC, settings.UPLOAD_BURST
+        )
+        self.mutations = ConcurrencyLimiter(
+            settings.MUTATION_CONCURRENCY,
+            settings.MUTATION_QUEUE_BUDGET_SEC,
+            self.loop_lag,
+            settings.ADMISSION_LOOP_LAG_BUDGET_SEC,
+        )
+        self.uploads = ConcurrencyLimiter(
+            settings.UPLOAD_CONCURRENCY,
+            settings.UPLOAD_QUEUE_BUDGET_SEC,
+            self.loop_lag,
+            settings.ADMISSION_LOOP_LAG_BUDGET_SEC,
+        )
+        self.rejected: dict[int, int] = {429: 0, 503: 0}
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "rejected_429": self.rejected[429],
+            "rejected_503": self.rejected[503],
+            "loop_lag_ms": round(self.loop_lag.lag * 1e3, 1),
+            "mutations_in_flight": self.mutations.in_flight,
+            "uploads_in_flight": self.uploads.in_flight,
+        }
+
+    def start(self) -> None:
+        # Lag is sampled even while disabled so /health still reports it
+        self.loop_lag.start()
+
+    async def stop(self) -> None:
+        await self.loop_lag.stop()
+
+
+ADMISSION = AdmissionController()
+
+
+def _client_key(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _reject(send: Send, exc: Rejected, close: bool = False) -> None:
+    body = json.dumps({"detail": exc.detail}).encode()
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(max(1, math.ceil(exc.retry_after))).encode()),
+    ]
+    if close:
+        headers.append((b"connection", b"close"))
+    await send(
+        {"type": "http.response.start", "status": exc.status_code, "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """Sheds mutating /api traffic before it reaches the routes.
+
+    Every POST/PUT/PATCH/DELETE under /api spends a token from its client's
+    bucket (uploads have their own), then takes a slot from the upload or
+    mutation limiter. Under overload, clients that have spent more than half
+    their burst are shed first. Reads and the WebSocket are never throttled.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = ADMISSION):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        ctl = self.controller
+        if (
+            not ctl.enabled
+            or scope["type"] != "http"
+            or scope["method"] not in MUTATING_METHODS
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == UPLOAD_PATH:
+            rate, limiter = ctl.upload_rate, ctl.uploads
+        else:
+            rate, limiter = ctl.mutation_rate, ctl.mutations
+        heavy = True
+        try:
+            bucket = rate.check(_client_key(scope))
+            heavy = bucket.tokens < bucket.capacity / 2
+            async with limiter.slot(heavy=heavy):
+                await self.app(scope, receive, send)
+        except Rejected as exc:
+            ctl.rejected[exc.status_code] += 1
+            # Make runaway clients pay for a new connection per retry
+            await _reject(send, exc, close=heavy)
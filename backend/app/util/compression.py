@@ -0,0 +1,173 @@
+import asyncio
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: pip install "web-buddy-backend[brotli]"
+    brotli = None
+
+# Bodies that are already compressed (or streamed to the browser as they
+# arrive) gain nothing from another pass.
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "text/event-stream")
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick "br" or "gzip" from an Accept-Encoding header, honoring q-values."""
+    offered: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[token.strip()] = q
+    wildcard = offered.get("*", 0.0)
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best: str | None = None
+    best_q = 0.0
+    for enc in supported:
+        q = offered.get(enc, wildcard)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli compression for HTTP responses under ``prefixes``.
+
+    Responses smaller than ``minimum_size`` are sent as-is; the size check
+    only applies to single-chunk bodies, streamed bodies are always
+    compressed. Chunks of at least ``thread_min_size`` bytes are compressed
+    in a worker thread so a large listing does not stall the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        prefixes: tuple[str, ...] = ("/api",),
+        thread_min_size: int = 256 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_min_size = thread_min_size
+        self.prefixes = prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefixes):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, mw: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.mw = mw
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Message | None = None
+        self.stream: _GzipStream | _BrotliStream | None = None
+        self.passthrough = False
+
+    def _new_stream(self) -> _GzipStream | _BrotliStream:
+        if self.encoding == "br":
+            return _BrotliStream(self.mw.brotli_quality)
+        return _GzipStream(self.mw.gzip_level)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+    async def _compress(
+        self, stream: _GzipStream | _BrotliStream, body: bytes, finish: bool
+    ) -> bytes:
+        def work() -> bytes:
+            out = stream.compress(body) if body else b""
+            return out + stream.finish() if finish else out
+
+        if len(body) >= self.mw.thread_min_size:
+            return await asyncio.to_thread(work)
+        return work()
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(
+                SKIP_CONTENT_TYPES
+            ):
+                self.passthrough = True
+                await self.downstream(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.stream is None:
+            assert self.start is not None
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body:
+                if len(body) < self.mw.minimum_size:
+                    self.passthrough = True
+                    await self.downstream(self.start)
+                    await self.downstream(message)
+                    return
+                body = await self._compress(self._new_stream(), body, finish=True)
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(body))
+                await self.downstream(self.start)
+                await self.downstream(
+                    {"type": "http.response.body", "body": body, "more_body": False}
+                )
+                return
+            self.stream = self._new_stream()
+            self._mark_encoded(headers)
+            del headers["Content-Length"]
+            await self.downstream(self.start)
+
+        chunk = await self._compress(self.stream, body, finish=not more_body)
+        await self.downstream(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
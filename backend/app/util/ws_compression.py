@@ -0,0 +1,41 @@
+from typing import Any
+
+from app.core.config import settings
+from uvicorn.protocols.websockets.websockets_sansio_impl import (
+    WebSocketsSansIOProtocol,
+)
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+
+
+def permessage_deflate_factory() -> ServerPerMessageDeflateFactory:
+    """Build the permessage-deflate offer from settings.
+
+    Without context takeover every message is compressed from scratch, which
+    costs ratio on small, repetitive events but frees the per-connection
+    compressor window between messages.
+    """
+    no_takeover = not settings.WS_DEFLATE_CONTEXT_TAKEOVER
+    return ServerPerMessageDeflateFactory(
+        server_no_context_takeover=no_takeover,
+        client_no_context_takeover=no_takeover,
+        server_max_window_bits=settings.WS_DEFLATE_MAX_WINDOW_BITS,
+        client_max_window_bits=settings.WS_DEFLATE_MAX_WINDOW_BITS,
+        compress_settings={"level": settings.WS_DEFLATE_LEVEL, "memLevel": 5},
+    )
+
+
+class DeflateWebSocketProtocol(WebSocketsSansIOProtocol):
+    """Uvicorn WebSocket protocol with configurable permessage-deflate.
+
+    Pass the class itself as ``ws=`` to ``uvicorn.run``/``uvicorn.Config``, as
+    the start/debug scripts do; Uvicorn's ``--ws`` flag and string values only
+    name its built-in protocols. The extension is negotiated during the
+    handshake, so ``websocket.accept()`` in the routes stays unchanged.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        enabled = settings.WS_DEFLATE_ENABLED and self.config.ws_per_message_deflate
+        self.conn.available_extensions = (
+            [permessage_deflate_factory()] if enabled else []
+        )
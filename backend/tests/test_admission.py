@@ -0,0 +1,268 @@
+import asyncio
+
+import pytest
+from app.util import admission
+from app.util.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    ClientRateLimiter,
+    ConcurrencyLimiter,
+    LoopLagMonitor,
+    Rejected,
+    TokenBucket,
+)
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", fake)
+    return fake
+
+
+def test_token_bucket_spends_burst_then_reports_wait(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.take() == 0.0
+
+
+def test_token_bucket_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.take()
+    clock.now += 60
+    assert bucket.is_full(clock.now)
+    assert bucket.tokens == 2
+
+
+def test_client_rate_limiter_is_per_client(clock):
+    limiter = ClientRateLimiter(rate=1, burst=1)
+    limiter.check("a")
+    with pytest.raises(Rejected) as exc:
+        limiter.check("a")
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after == pytest.approx(1.0)
+    limiter.check("b")
+
+
+def test_client_rate_limiter_prunes_only_idle_buckets(clock):
+    limiter = ClientRateLimiter(rate=1, burst=2, max_clients=2)
+    limiter.check("busy")
+    limiter.check("idle")
+    clock.now += 1.5  # "idle" refills to full, "busy" spends again below
+    limiter.check("busy")
+
+    limiter.check("new")
+
+    assert set(limiter._buckets) == {"busy", "new"}
+
+
+def test_loop_lag_is_minimum_of_recent_samples():
+    monitor = LoopLagMonitor(window=3)
+    for sample in (0.2, 0.01, 0.3):
+        monitor.record(sample)
+    assert monitor.lag == pytest.approx(0.01)
+    monitor.record(0.25)
+    monitor.record(0.4)
+    assert monitor.lag == pytest.approx(0.25)
+
+
+def test_loop_lag_budget_sheds_heavy_before_light():
+    lag = LoopLagMonitor(window=1)
+    limiter = ConcurrencyLimiter(limit=4, budget=1.0, lag=lag, lag_budget=0.05)
+    lag.record(0.08)
+
+    async def go(heavy: bool) -> None:
+        async with limiter.slot(heavy=heavy):
+            pass
+
+    with pytest.raises(Rejected) as exc:
+        asyncio.run(go(heavy=True))
+    assert exc.value.status_code == 503
+    asyncio.run(go(heavy=False))
+
+    lag.record(0.2)
+    with pytest.raises(Rejected):
+        asyncio.run(go(heavy=False))
+
+
+def test_estimated_wait_over_budget_rejects_without_queueing():
+    limiter = ConcurrencyLimiter(limit=1, budget=0.1)
+    limiter.avg_service = 1.0
+
+    async def scenario() -> None:
+        async with limiter.slot():
+            with pytest.raises(Rejected) as exc:
+                async with limiter.slot():
+                    pass
+            assert exc.value.retry_after == pytest.approx(1.0)
+            assert limiter.waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_rejects_and_does_not_leak_slots():
+    limiter = ConcurrencyLimiter(limit=1, budget=0.05)
+    limiter.avg_service = 0.0
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def holder() -> None:
+            async with limiter.slot():
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as exc:
+            async with limiter.slot():
+                pass
+        assert exc.value.status_code == 503
+        release.set()
+        await task
+        assert limiter.in_flight == 0
+        assert limiter.waiting == 0
+        async with limiter.slot():
+            assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_light_waiters_are_served_before_heavy():
+    limiter = ConcurrencyLimiter(limit=1, budget=5.0)
+    limiter.avg_service = 0.0
+    order: list[str] = []
+
+    async def worker(name: str, heavy: bool) -> None:
+        async with limiter.slot(heavy=heavy):
+            order.append(name)
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def holder() -> None:
+            async with limiter.slot():
+                await release.wait()
+
+        first = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(worker("heavy", True)),
+            asyncio.create_task(worker("light", False)),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, *tasks)
+
+    asyncio.run(scenario())
+    assert order == ["light", "heavy"]
+
+
+async def ok(request):
+    return JSONResponse({"ok": True})
+
+
+def make_client(controller: AdmissionController) -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/api/assets", ok, methods=["GET", "POST"]),
+            Route("/api/assets/upload", ok, methods=["POST"]),
+            Route("/api/assets/{aid}", ok, methods=["PUT"]),
+        ]
+    )
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    return TestClient(app)
+
+
+def overload(ctl: AdmissionController, lag: float) -> None:
+    ctl.loop_lag._samples.clear()
+    ctl.loop_lag.record(lag)
+
+
+def test_rate_limited_mutation_gets_429_with_retry_after():
+    ctl = AdmissionController()
+    ctl.enabled = True
+    ctl.mutation_rate = ClientRateLimiter(rate=0.1, burst=1)
+    client = make_client(ctl)
+
+    assert client.put("/api/assets/a").status_code == 200
+    r = client.put("/api/assets/a")
+
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "10"
+    assert r.json() == {"detail": "Too many requests"}
+    assert r.headers["connection"] == "close"
+    assert ctl.stats()["rejected_429"] == 1
+
+
+def test_light_client_rejection_keeps_connection_open():
+    ctl = AdmissionController()
+    ctl.enabled = True
+    overload(ctl, 0.05)  # over budget for heavy clients only
+    ctl.mutations.lag_budget = 0.01
+    client = make_client(ctl)
+
+    r = client.put("/api/assets/a")
+
+    assert r.status_code == 503
+    assert "connection" not in r.headers
+
+
+def test_overloaded_mutation_gets_503_with_retry_after():
+    ctl = AdmissionController()
+    ctl.enabled = True
+    overload(ctl, 2.5)
+    client = make_client(ctl)
+
+    r = client.put("/api/assets/a")
+
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "3"
+    assert ctl.stats()["rejected_503"] == 1
+
+
+def test_reads_are_never_limited():
+    ctl = AdmissionController()
+    ctl.enabled = True
+    ctl.mutation_rate = ClientRateLimiter(rate=0.1, burst=1)
+    overload(ctl, 5.0)
+    client = make_client(ctl)
+
+    assert all(client.get("/api/assets").status_code == 200 for _ in range(5))
+
+
+def test_default_limits_admit_a_100_file_drop():
+    # The frontend uploads each dropped file, then creates its asset
+    ctl = AdmissionController()
+    ctl.enabled = True
+    client = make_client(ctl)
+
+    statuses = set()
+    for _ in range(100):
+        statuses.add(client.post("/api/assets/upload").status_code)
+        statuses.add(client.post("/api/assets").status_code)
+
+    assert statuses == {200}
+
+
+def test_health_exposes_admission_counters():
+    from app.main import app
+
+    body = TestClient(app).get("/health").json()
+
+    assert body["status"] == "ok"
+    assert {"rejected_429", "rejected_503", "loop_lag_ms"} <= body["admission"].keys()
@@ -0,0 +1,142 @@
+import pytest
+from app.util import compression
+from app.util.compression import CompressionMiddleware, negotiate_encoding
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+BIG = "asset " * 1000
+
+
+@pytest.fixture
+def no_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", pytest.importorskip("brotli"))
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("gzip;q=0, br;q=0", None),
+        ("*", "br"),
+        ("*;q=0.5, gzip;q=0.8", "gzip"),
+        ("*, br;q=0", "gzip"),
+        ("GZIP ; q=1", "gzip"),
+        ("gzip;q=bogus", None),
+    ],
+)
+def test_negotiate_encoding(with_brotli, header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_encoding_without_brotli_falls_back_to_gzip(no_brotli):
+    assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("*") == "gzip"
+
+
+def stream_body():
+    for _ in range(5):
+        yield b"chunk " * 10
+
+
+def make_client(**options) -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/api/big", lambda r: PlainTextResponse(BIG)),
+            Route("/api/small", lambda r: PlainTextResponse("tiny")),
+            Route("/api/stream", lambda r: StreamingResponse(stream_body())),
+            Route(
+                "/api/png",
+                lambda r: Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png"),
+            ),
+            Route("/other", lambda r: PlainTextResponse(BIG)),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, **options)
+    return TestClient(app)
+
+
+def test_large_api_response_is_gzipped(no_brotli):
+    r = make_client().get("/api/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert int(r.headers["content-length"]) < len(BIG)
+    assert r.text == BIG
+
+
+def test_large_api_response_prefers_brotli(with_brotli):
+    r = make_client().get("/api/big", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["content-encoding"] == "br"
+    assert r.text == BIG
+
+
+@pytest.mark.parametrize("path", ["/api/small", "/api/png", "/other"])
+def test_small_binary_and_non_api_responses_are_untouched(no_brotli, path):
+    r = make_client().get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+
+
+def test_no_acceptable_encoding_sends_identity(no_brotli):
+    r = make_client().get("/api/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.text == BIG
+
+
+def test_streamed_response_is_compressed_regardless_of_size(no_brotli):
+    r = make_client().get("/api/stream", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "content-length" not in r.headers
+    assert r.content == b"".join(stream_body())
+
+
+@pytest.fixture
+def offloaded(monkeypatch):
+    calls = []
+    to_thread = compression.asyncio.to_thread
+
+    async def recording(func, *args, **kwargs):
+        calls.append(func)
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(compression.asyncio, "to_thread", recording)
+    return calls
+
+
+def test_large_body_is_compressed_in_a_thread(no_brotli, offloaded):
+    client = make_client(thread_min_size=len(BIG))
+
+    r = client.get("/api/big", headers={"Accept-Encoding": "gzip"})
+
+    assert len(offloaded) == 1
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text == BIG
+
+
+def test_body_below_thread_threshold_is_compressed_inline(no_brotli, offloaded):
+    client = make_client(thread_min_size=len(BIG) + 1)
+
+    r = client.get("/api/big", headers={"Accept-Encoding": "gzip"})
+
+    assert offloaded == []
+    assert r.text == BIG
+
+
+def test_large_streamed_chunks_are_compressed_in_a_thread(no_brotli, offloaded):
+    client = make_client(thread_min_size=1)
+
+    r = client.get("/api/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert len(offloaded) == 5
+    assert r.content == b"".join(stream_body())
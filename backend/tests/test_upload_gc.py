@@ -0,0 +1,190 @@
+import asyncio
+import os
+import time
+
+import pytest
+from app.core.config import settings
+from app.models.asset_models import AssetCreate, AssetUpdate
+from app.models.screen_models import ScreenCreate
+from app.services.upload_gc import UploadGarbageCollector
+from app.state.memory_state import InMemoryState
+
+BASE = "http://localhost:8000/uploads/"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def state():
+    return InMemoryState()
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    def make(*names: str, age: float = 3600.0):
+        for name in names:
+            path = tmp_path / name
+            path.write_bytes(b"x" * 10)
+            old = path.stat().st_mtime - age
+            os.utime(path, (old, old))
+
+    make.dir = tmp_path
+    return make
+
+
+def image(screen_id: str, name: str) -> AssetCreate:
+    return AssetCreate(screen_id=screen_id, type="image", src=BASE + name)
+
+
+def remaining(uploads) -> set[str]:
+    return set(os.listdir(uploads.dir))
+
+
+def test_unreferenced_file_is_deleted_and_referenced_kept(state, uploads):
+    uploads("kept.png", "orphan.png")
+    run(state.create_asset(image("s", "kept.png")))
+    gc = UploadGarbageCollector(state, directory=uploads.dir, grace=0)
+
+    result = run(gc.sweep())
+
+    assert remaining(uploads) == {"kept.png"}
+    assert result.deleted == 1
+    assert result.reclaimed_bytes == 10
+
+
+def test_update_repointing_src_releases_old_file(state, uploads):
+    uploads("old.png", "new.png")
+    asset = run(state.create_asset(image("s", "old.png")))
+    run(state.update_asset(asset.id, AssetUpdate(src=BASE + "new.png")))
+
+    run(UploadGarbageCollector(state, directory=uploads.dir, grace=0).sweep())
+
+    assert remaining(uploads) == {"new.png"}
+
+
+def test_delete_asset_releases_file_only_when_last_reference_goes(state, uploads):
+    uploads("shared.png")
+    a = run(state.create_asset(image("s", "shared.png")))
+    b = run(state.create_asset(image("s", "shared.png")))
+    gc = UploadGarbageCollector(state, directory=uploads.dir, grace=0)
+
+    run(state.delete_asset(a.id))
+    run(gc.sweep())
+    assert remaining(uploads) == {"shared.png"}
+
+    run(state.delete_asset(b.id))
+    run(gc.sweep())
+    assert remaining(uploads) == set()
+
+
+def test_delete_screen_releases_its_assets_files(state, uploads):
+    uploads("one.png", "two.png")
+    screen = run(state.create_screen(ScreenCreate(name="s", width=10, height=10)))
+    run(state.create_asset(image(screen.id, "one.png")))
+    run(state.create_asset(image("other", "two.png")))
+
+    run(state.delete_screen(screen.id))
+    run(UploadGarbageCollector(state, directory=uploads.dir, grace=0).sweep())
+
+    assert remaining(uploads) == {"two.png"}
+
+
+def test_grace_period_counts_from_upload_and_from_release(state, uploads):
+    uploads("fresh.png", age=0)
+    uploads("released.png")
+    asset = run(state.create_asset(image("s", "released.png")))
+    run(state.delete_asset(asset.id))
+    gc = UploadGarbageCollector(state, directory=uploads.dir, grace=60)
+
+    result = run(gc.sweep())
+
+    assert result.deleted == 0
+    assert remaining(uploads) == {"fresh.png", "released.png"}
+
+
+@pytest.mark.parametrize("name", ["abc.jpé", "abc.tar gz"])
+def test_percent_encoded_src_still_references_file(state, uploads, name):
+    uploads(name)
+    asset = run(state.create_asset(image("s", name)))
+    assert "%" in str(asset.src)
+
+    run(UploadGarbageCollector(state, directory=uploads.dir, grace=0).sweep())
+
+    assert remaining(uploads) == {name}
+
+
+def test_failed_unlink_keeps_release_time(state, uploads, monkeypatch):
+    uploads("stuck.png")
+    asset = run(state.create_asset(image("s", "stuck.png")))
+    run(state.delete_asset(asset.id))
+    released = state.upload_released_at("stuck.png")
+
+    def refuse(self, *args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr("pathlib.Path.unlink", refuse)
+    result = run(UploadGarbageCollector(state, directory=uploads.dir, grace=0).sweep())
+
+    assert result.deleted == 0
+    assert state.upload_released_at("stuck.png") == released
+
+
+def test_mutations_interleave_with_deletions(state, uploads, monkeypatch):
+    uploads("a.png", "b.png", "c.png")
+    gc = UploadGarbageCollector(state, directory=uploads.dir, grace=0)
+    unlink = gc._unlink
+
+    def slow_unlink(name):
+        time.sleep(0.05)
+        unlink(name)
+
+    monkeypatch.setattr(gc, "_unlink", slow_unlink)
+
+    async def scenario():
+        sweep = asyncio.create_task(gc.sweep())
+        await asyncio.sleep(0.02)
+        # Lands while the first file is being removed; must neither wait for
+        # the whole sweep nor lose its file
+        await state.create_asset(image("s", "c.png"))
+        created_early = not sweep.done()
+        return created_early, await sweep
+
+    created_early, result = run(scenario())
+
+    assert created_early
+    assert result.deleted == 2
+    assert remaining(uploads) == {"c.png"}
+
+
+def test_release_times_of_missing_files_are_dropped(state, uploads, monkeypatch):
+    uploads("vanishing.png")
+    for name in ("ghost.png", "vanishing.png"):
+        asset = run(state.create_asset(image("s", name)))
+        run(state.delete_asset(asset.id))
+    gc = UploadGarbageCollector(state, directory=uploads.dir, grace=0)
+
+    def already_gone(name):
+        raise FileNotFoundError(name)
+
+    monkeypatch.setattr(gc, "_unlink", already_gone)
+    result = run(gc.sweep())
+
+    assert result.deleted == 0
+    assert state.upload_released_at("ghost.png") is None
+    assert state.upload_released_at("vanishing.png") is None
+
+
+def test_only_public_base_url_host_references_uploads(state, uploads, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_BASE_URL", "http://localhost:8000/")
+    uploads("mine.png", "theirs.png")
+    run(state.create_asset(image("s", "mine.png")))
+    external = AssetCreate(
+        screen_id="s", type="image", src="https://cdn.example.com/uploads/theirs.png"
+    )
+    run(state.create_asset(external))
+
+    run(UploadGarbageCollector(state, directory=uploads.dir, grace=0).sweep())
+
+    assert remaining(uploads) == {"mine.png"}
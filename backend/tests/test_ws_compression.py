@@ -0,0 +1,96 @@
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from app.core.config import settings
+from app.main import app
+from app.scripts import debug, start
+from app.util.ws_compression import DeflateWebSocketProtocol
+from websockets.sync.client import connect
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    # Same way the start/debug scripts pass it: the class, not an import string
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        ws=DeflateWebSocketProtocol,
+        lifespan="off",
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "uvicorn did not start"
+        time.sleep(0.01)
+    yield f"ws://127.0.0.1:{port}/ws"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def negotiated(url: str) -> str | None:
+    with connect(url) as ws:
+        return ws.response.headers.get("Sec-WebSocket-Extensions")
+
+
+def params(header: str) -> dict[str, str | None]:
+    name, *rest = [p.strip() for p in header.split(";")]
+    assert name == "permessage-deflate"
+    return {k: v or None for k, _, v in (p.partition("=") for p in rest)}
+
+
+def test_handshake_uses_configured_window_bits(server_url):
+    bits = str(settings.WS_DEFLATE_MAX_WINDOW_BITS)
+
+    header = negotiated(server_url)
+
+    assert header is not None
+    assert params(header) == {
+        "server_max_window_bits": bits,
+        "client_max_window_bits": bits,
+    }
+
+
+def test_handshake_without_context_takeover(server_url, monkeypatch):
+    monkeypatch.setattr(settings, "WS_DEFLATE_CONTEXT_TAKEOVER", False)
+    monkeypatch.setattr(settings, "WS_DEFLATE_MAX_WINDOW_BITS", 10)
+
+    header = negotiated(server_url)
+
+    assert header is not None
+    assert params(header) == {
+        "server_no_context_takeover": None,
+        "client_no_context_takeover": None,
+        "server_max_window_bits": "10",
+        "client_max_window_bits": "10",
+    }
+
+
+def test_disabled_deflate_negotiates_no_extension(server_url, monkeypatch):
+    monkeypatch.setattr(settings, "WS_DEFLATE_ENABLED", False)
+
+    assert negotiated(server_url) is None
+
+
+@pytest.mark.parametrize("script", [start, debug])
+def test_launch_scripts_config_loads(script, monkeypatch):
+    # Config.load() is where a --ws style import string used to blow up
+    captured = {}
+    monkeypatch.setattr(
+        uvicorn, "run", lambda app, **kwargs: captured.update(kwargs, app=app)
+    )
+    script.main()
+
+    config = uvicorn.Config(**captured)
+    config.load()
+
+    assert config.ws_protocol_class is DeflateWebSocketProtocol